@@ -4,17 +4,84 @@ import os
 import sys
 import datetime
 import subprocess
+import threading
+import concurrent.futures
 import time
 from abc import ABC
 
+# Minimum interval between status-bar updates; robocopy can emit hundreds
+# of progress lines per second and the UI cannot show them anyway
+STATUS_UPDATE_INTERVAL = 0.1
+
+# How many robocopy processes to run at once. Robocopy is already
+# multi-threaded internally (/MT:32), so a few outer workers for
+# independent source trees is enough without thrashing the destination
+MAX_PARALLEL_ROBOCOPY = 4
+
+# Log directory, resolved once at import; expanduser hits the environment
+# (and the registry on Windows) on every call
+_LOG_DIR = os.path.join(os.path.expanduser('~'), '.fman')
+_log_dir_created = False
+
+def _ensure_log_dir():
+    """Create the log directory on first use only."""
+    global _log_dir_created
+    if not _log_dir_created:
+        os.makedirs(_LOG_DIR, exist_ok=True)
+        _log_dir_created = True
+    return _LOG_DIR
+
+def _is_dir_map(paths):
+    """Map each path to whether it is a directory, using one scandir per
+    parent directory instead of one stat per path. On Windows
+    DirEntry.is_dir() comes straight from the directory listing, so a
+    selection of N files from one folder costs one scandir, not N stats."""
+    wanted = {}
+    for path in paths:
+        wanted.setdefault(os.path.dirname(path), set()).add(os.path.basename(path))
+    result = {}
+    for parent, names in wanted.items():
+        try:
+            with os.scandir(parent) as entries:
+                for entry in entries:
+                    if entry.name in names:
+                        result[os.path.join(parent, entry.name)] = entry.is_dir()
+        except OSError:
+            pass
+    # Anything the listings did not cover falls back to a direct stat
+    for path in paths:
+        if path not in result:
+            result[path] = os.path.isdir(path)
+    return result
+
 class SyncFilesTask(Task):
     def __init__(self, files_to_sync, target_path, target_pane):
         super().__init__('Syncing Files')
-        self._files = files_to_sync
+        self._jobs = self._group_files(files_to_sync)
         self._target_path = target_path
         self._target_pane = target_pane
-        self._current_process = None
-        self.set_size(len(files_to_sync))
+        self._processes = set()
+        self._process_lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self.set_size(len(self._jobs))
+
+    def _group_files(self, files_to_sync):
+        """Group plain files by source directory so all files from one
+        directory share a single robocopy invocation. Directories keep
+        their own command because of /e. Returns a list of
+        (source_dir_or_path, filenames) where filenames is None for
+        directories."""
+        jobs = []
+        file_groups = {}
+        for source_path, is_dir in files_to_sync:
+            if is_dir:
+                jobs.append((source_path, None))
+            else:
+                file_groups.setdefault(os.path.dirname(source_path), []) \
+                    .append(os.path.basename(source_path))
+        for source_dir, filenames in file_groups.items():
+            jobs.append((source_dir, filenames))
+        return jobs
 
     def _interpret_robocopy_exit_code(self, exit_code):
         """Interpret robocopy exit codes and return a tuple of (success, message)"""
@@ -34,95 +101,201 @@ class SyncFilesTask(Task):
         else:
             return False, f"Serious error occurred (code {exit_code})"
 
-    def __call__(self):
+    @staticmethod
+    def _is_up_to_date(source_path, dest_path):
+        """True if dest exists with the same size and is at least as new as
+        source, i.e. robocopy would copy nothing."""
         try:
-            # Setup log file
-            log_dir = os.path.expanduser("~/.fman")
-            os.makedirs(log_dir, exist_ok=True)
-            log_file = os.path.join(log_dir, "sync_commands.log")
-
-            # Process each file
-            for i, (source_path, is_dir) in enumerate(self._files, 1):
-                filename = os.path.basename(source_path)
-                self.set_text(f'Copying {i} of {len(self._files)}: {filename}')
-
-                # Generate robocopy command with progress output
-                if is_dir:
-                    cmd = f'robocopy "{source_path}" "{self._target_path}/{filename}" /e /MT:32 /bytes /np'
+            source_stat = os.stat(source_path)
+            dest_stat = os.stat(dest_path)
+        except OSError:
+            return False
+        return (dest_stat.st_size == source_stat.st_size
+                and dest_stat.st_mtime >= source_stat.st_mtime)
+
+    def _kill_running_processes(self):
+        with self._process_lock:
+            for process in self._processes:
+                if process.poll() is None:
+                    process.kill()
+
+    def _run_job(self, i, n_jobs, source_path, filenames, lf, log_lock):
+        """Run one robocopy invocation. Executed on a pool worker thread;
+        log writes are serialized through log_lock."""
+        if self._cancel_event.is_set():
+            return
+        _basename = os.path.basename
+        log_fmt = '[%s] %s\n'
+
+        if filenames is not None:
+            # Skip files whose destination copy is already current; each
+            # one avoided saves a whole robocopy spawn for zero work
+            remaining = []
+            skipped = []
+            for name in filenames:
+                if self._is_up_to_date(os.path.join(source_path, name),
+                                       os.path.join(self._target_path, name)):
+                    skipped.append(name)
                 else:
-                    cmd = f'robocopy "{os.path.dirname(source_path)}" "{self._target_path}" "{filename}" /MT:32 /bytes /np'
-
-                # Log command with timestamp
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(f'[{timestamp}] {cmd}\n')
-
-                # Setup process startup info for Windows
-                startupinfo = None
-                if sys.platform.startswith('win'):
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-                # Execute robocopy command
-                self._current_process = subprocess.Popen(
-                    cmd,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    startupinfo=startupinfo,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-
-                # Monitor output and progress
-                while True:
-                    self.check_canceled()
-                    
-                    # Read a line of output
-                    output_line = self._current_process.stdout.readline()
-                    if not output_line and self._current_process.poll() is not None:
-                        break
-                        
-                    # Log output
-                    with open(log_file, 'a', encoding='utf-8') as f:
-                        f.write(output_line)
-                        
-                    # Update status if it contains progress information
-                    if "%" in output_line:
-                        self.set_text(f'Copying {i} of {len(self._files)}: {filename} - {output_line.strip()}')
-
-                # Get remaining output and exit code
-                stdout, stderr = self._current_process.communicate()
-                exit_code = self._current_process.returncode
-                success, message = self._interpret_robocopy_exit_code(exit_code)
-
-                # Log completion and status
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(f'[{timestamp}] {message} (Exit Code: {exit_code})\n')
-                    if stderr:
-                        f.write(f'[{timestamp}] Errors: {stderr}\n')
-
-                if not success:
-                    show_status_message(f'Warning: {message} while copying {filename}')
-
-                # Update progress
-                self.set_progress(i)
-
-                # Refresh the target pane
+                    remaining.append(name)
+            if skipped:
+                skip_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                with log_lock:
+                    for name in skipped:
+                        lf.write(log_fmt % (skip_time, f'{name} skipped (up-to-date)'))
+            if not remaining:
+                return
+            filenames = remaining
+
+        # Generate robocopy arguments with progress output
+        if filenames is None:
+            filename = _basename(source_path)
+            args = ['robocopy', source_path,
+                    f'{self._target_path}/{filename}',
+                    '/e', '/MT:32', '/bytes', '/np']
+        elif len(filenames) == 1:
+            # /MT cannot split a single file across threads, so its
+            # 32-thread pool startup would be pure overhead here
+            filename = filenames[0]
+            args = ['robocopy', source_path, self._target_path,
+                    filename, '/bytes', '/np']
+        else:
+            filename = f'{len(filenames)} files from {source_path}'
+            args = ['robocopy', source_path, self._target_path,
+                    *filenames, '/MT:32', '/bytes', '/np']
+        self.set_text(f'Copying {i} of {n_jobs}: {filename}')
+
+        # One timestamp per job, shared by all its log lines
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with log_lock:
+            lf.write(log_fmt % (timestamp, subprocess.list2cmdline(args)))
+
+        # Setup process startup info for Windows
+        startupinfo = None
+        if sys.platform.startswith('win'):
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+        # Execute robocopy directly; going through the shell would cost
+        # an extra cmd.exe per job. stderr is merged into stdout so the
+        # single read loop drains both and neither pipe can fill up and
+        # block robocopy
+        process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            startupinfo=startupinfo,
+            encoding='utf-8',
+            errors='replace'
+        )
+        with self._process_lock:
+            self._processes.add(process)
+        try:
+            # A cancel may have arrived between Popen and registration
+            if self._cancel_event.is_set():
+                process.kill()
+
+            # readline() blocks until robocopy produces output and
+            # returns '' at EOF (or after kill), so no polling is needed.
+            # Output lines are buffered and handed to writelines() in
+            # ~16KB chunks, which also keeps log-lock traffic low
+            pending = []
+            pending_size = 0
+            last_update = 0.0
+            for output_line in iter(process.stdout.readline, ''):
+                if self._cancel_event.is_set():
+                    break
+
+                # Buffer output for the log
+                pending.append(output_line)
+                pending_size += len(output_line)
+                if pending_size > 16384:
+                    with log_lock:
+                        lf.writelines(pending)
+                    pending.clear()
+                    pending_size = 0
+
+                # Update status if it contains progress information,
+                # but at most every STATUS_UPDATE_INTERVAL seconds
+                if "%" in output_line:
+                    now = time.monotonic()
+                    if now - last_update > STATUS_UPDATE_INTERVAL:
+                        last_update = now
+                        self.set_text(f'Copying {i} of {n_jobs}: {filename} - {output_line.strip()}')
+
+            # Reap the process and get the exit code
+            process.communicate()
+            exit_code = process.returncode
+        finally:
+            with self._process_lock:
+                self._processes.discard(process)
+
+        success, message = self._interpret_robocopy_exit_code(exit_code)
+
+        # Log completion and status; flush once per completed job so the
+        # log stays current without paying a write syscall per line
+        with log_lock:
+            if pending:
+                lf.writelines(pending)
+            lf.write(log_fmt % (timestamp, f'{message} (Exit Code: {exit_code})'))
+            lf.flush()
+
+        if not success:
+            show_status_message(f'Warning: {message} while copying {filename}')
+
+    def __call__(self):
+        # Setup log file
+        log_file = os.path.join(_ensure_log_dir(), "sync_commands.log")
+
+        # Keep one buffered handle open for the whole task instead of
+        # re-opening the log file for every line
+        with open(log_file, 'a', buffering=65536, encoding='utf-8') as lf:
+            n_jobs = len(self._jobs)
+            log_lock = threading.Lock()
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            try:
+                # Independent jobs (disjoint source trees) run in parallel
+                # on a small pool; see MAX_PARALLEL_ROBOCOPY
+                with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=min(MAX_PARALLEL_ROBOCOPY, n_jobs)) as pool:
+                    pending = {
+                        pool.submit(self._run_job, i, n_jobs,
+                                    source_path, filenames, lf, log_lock)
+                        for i, (source_path, filenames)
+                        in enumerate(self._jobs, 1)
+                    }
+                    completed = 0
+                    try:
+                        while pending:
+                            self.check_canceled()
+                            done, pending = concurrent.futures.wait(
+                                pending, timeout=0.05)
+                            for future in done:
+                                future.result()
+                                completed += 1
+                                self.set_progress(completed)
+                    except BaseException:
+                        # Stop the workers before the pool shutdown joins
+                        # them, or it would block until robocopy finishes
+                        self._cancel_event.set()
+                        self._kill_running_processes()
+                        raise
+
+                # Refresh the target pane once after all jobs; reloading
+                # per job re-enumerates the destination every time
                 self._target_pane.reload()
 
-        except Task.Canceled:
-            # Handle cancellation
-            if self._current_process and self._current_process.poll() is None:
-                self._current_process.kill()
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(f'[{timestamp}] Task canceled by user\n')
-            show_status_message('Sync canceled')
-            raise
-        except Exception as e:
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(f'[{timestamp}] Error: {str(e)}\n')
-            raise
+            except Task.Canceled:
+                # Handle cancellation
+                with log_lock:
+                    lf.write(f'[{timestamp}] Task canceled by user\n')
+                show_status_message('Sync canceled')
+                self._target_pane.reload()
+                raise
+            except Exception as e:
+                with log_lock:
+                    lf.write(f'[{timestamp}] Error: {str(e)}\n')
+                raise
 
 class SyncFilesBase(ABC):
     def __init__(self, pane):
@@ -156,9 +329,7 @@ class SyncFilesBase(ABC):
             return None
 
     def _ensure_log_dir(self):
-        log_dir = os.path.expanduser("~/.fman")
-        os.makedirs(log_dir, exist_ok=True)
-        return log_dir
+        return _ensure_log_dir()
 
 class SyncSelectedFilesToOtherPaneDryRunForWindows(DirectoryPaneCommand, SyncFilesBase):
     aliases = ('Sync selected files to other pane - dry run',)
@@ -181,27 +352,35 @@ class SyncSelectedFilesToOtherPaneDryRunForWindows(DirectoryPaneCommand, SyncFil
         # Setup log file
         log_dir = self._ensure_log_dir()
         log_file = os.path.join(log_dir, "sync_commands_dry_run.log")
-        
-        # Delete existing log file
-        if os.path.exists(log_file):
-            os.remove(log_file)
 
-        # Process each selected file/folder
-        total_elements = len(selected_files)
-        for i, file_url in enumerate(selected_files, 1):
-            show_status_message(f'Processing element {i} of {total_elements}: {os.path.basename(file_url)}')
-            source_path = as_human_readable(file_url)
-            
+        # Convert each URL only once, then build all log lines in memory
+        source_paths = [as_human_readable(file_url) for file_url in selected_files]
+        is_dir = _is_dir_map(source_paths)
+        total_elements = len(source_paths)
+        last_update = 0.0
+        lines = []
+        for i, source_path in enumerate(source_paths, 1):
+            # Throttle status updates; the UI cannot show more than a
+            # few per second anyway
+            now = time.monotonic()
+            if now - last_update > STATUS_UPDATE_INTERVAL:
+                last_update = now
+                show_status_message(f'Processing element {i} of {total_elements}: {os.path.basename(source_path)}')
+
             # Generate robocopy command with progress output flags
-            if os.path.isdir(source_path):
+            if is_dir[source_path]:
                 cmd = f'robocopy "{source_path}" "{target_path}/{os.path.basename(source_path)}" /e /MT:32 /bytes /np'
             else:
-                cmd = f'robocopy "{os.path.dirname(source_path)}" "{target_path}" "{os.path.basename(source_path)}" /MT:32 /bytes /np'
+                # No /MT for a single file; see SyncFilesTask._run_job
+                cmd = f'robocopy "{os.path.dirname(source_path)}" "{target_path}" "{os.path.basename(source_path)}" /bytes /np'
 
-            # Log command with timestamp
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(f'[{timestamp}] {cmd}\n')
+            lines.append(f'[{timestamp}] {cmd}\n')
+
+        # One write in 'w' mode replaces the previous delete-then-append
+        # pattern and the per-line opens
+        with open(log_file, 'w', encoding='utf-8') as lf:
+            lf.write(''.join(lines))
 
         show_status_message('Robocopy commands logged to ~/.fman/sync_commands_dry_run.log')
 
@@ -231,11 +410,11 @@ class SyncSelectedFilesToOtherPaneForWindows(DirectoryPaneCommand, SyncFilesBase
         if os.path.exists(log_file):
             os.remove(log_file)
 
-        # Prepare files list
-        files_to_sync = [
-            (as_human_readable(file_url), os.path.isdir(as_human_readable(file_url))) 
-            for file_url in selected_files
-        ]
+        # Prepare files list (convert each URL only once, one scandir per
+        # source directory instead of one stat per file)
+        source_paths = [as_human_readable(file_url) for file_url in selected_files]
+        is_dir = _is_dir_map(source_paths)
+        files_to_sync = [(path, is_dir[path]) for path in source_paths]
 
         # Create and submit single task for all files
         task = SyncFilesTask(files_to_sync, target_path, target_pane)